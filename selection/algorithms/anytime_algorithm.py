@@ -78,7 +78,7 @@ class AnytimeAlgorithm(SelectionAlgorithm):
         start_time = time.time()
         best_configuration = (None, None)
         for i, seed in enumerate(seeds):
-            logging.info(f"Seed {i + 1} from {len(seeds)}")
+            logging.info("Seed %s from %s", i + 1, len(seeds))
             candidates_copy = candidates.copy()
             candidates_copy -= seed
             current_costs = self._simulate_and_evaluate_cost(workload, seed)
@@ -92,12 +92,12 @@ class AnytimeAlgorithm(SelectionAlgorithm):
             consumed_time = current_time - start_time
             if consumed_time > self.max_runtime_minutes * 60:
                 logging.info(
-                    f"Stopping after {i + 1} seeds because of timing constraints."
+                    "Stopping after %s seeds because of timing constraints.", i + 1
                 )
                 break
             else:
                 logging.debug(
-                    f"Current best: {best_configuration[1]} after {consumed_time}s."
+                    "Current best: %s after %ss.", best_configuration[1], consumed_time
                 )
 
         indexes = best_configuration[0]
@@ -133,7 +133,7 @@ class AnytimeAlgorithm(SelectionAlgorithm):
         # (index, cost)
         best_index = (None, None)
 
-        logging.debug(f"Searching in {len(candidate_indexes)} indexes")
+        logging.debug("Searching in %s indexes", len(candidate_indexes))
 
         for index in candidate_indexes:
             if (
@@ -151,7 +151,7 @@ class AnytimeAlgorithm(SelectionAlgorithm):
             candidate_indexes.remove(best_index[0])
             current_costs = best_index[1]
 
-            logging.debug(f"Additional best index found: {best_index}")
+            logging.debug("Additional best index found: %s", best_index)
 
             return self.enumerate_greedy(
                 workload,
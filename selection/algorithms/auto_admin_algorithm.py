@@ -59,14 +59,14 @@ class AutoAdminAlgorithm(SelectionAlgorithm):
         candidates = set()
 
         for query in workload.queries:
-            logging.debug(f"Find candidates for query\t{query}...")
+            logging.debug("Find candidates for query\t%s...", query)
             # Create a workload consisting of one query
             query_workload = Workload([query])
             indexes = self._potential_indexes_for_query(query, potential_indexes)
             candidates |= self.enumerate_combinations(query_workload, indexes)
 
         logging.info(
-            f"Number of candidates: {len(candidates)}\n" f"Candidates: {candidates}"
+            "Number of candidates: %s\nCandidates: %s", len(candidates), candidates
         )
         return candidates
 
@@ -79,23 +79,24 @@ class AutoAdminAlgorithm(SelectionAlgorithm):
         return indexes
 
     def enumerate_combinations(self, workload, candidate_indexes):
-        log_out = (
-            f"Start Enumeration\n"
-            f"\tNumber of candidate indexes: {len(candidate_indexes)}\n"
-            f"\tNumber of indexes to be selected: {self.max_indexes}"
+        logging.debug(
+            "Start Enumeration\n"
+            "\tNumber of candidate indexes: %s\n"
+            "\tNumber of indexes to be selected: %s",
+            len(candidate_indexes),
+            self.max_indexes,
         )
-        logging.debug(log_out)
 
         number_indexes_naive = min(self.max_indexes_naive, len(candidate_indexes))
         current_indexes, costs = self.enumerate_naive(
             workload, candidate_indexes, number_indexes_naive
         )
 
-        log_out = (
-            f"lowest cost (naive): {costs}\n"
-            f"\tlowest cost indexes (naive): {current_indexes}"
+        logging.debug(
+            "lowest cost (naive): %s\n\tlowest cost indexes (naive): %s",
+            costs,
+            current_indexes,
         )
-        logging.debug(log_out)
 
         number_indexes = min(self.max_indexes, len(candidate_indexes))
         indexes, costs = self.enumerate_greedy(
@@ -106,12 +107,14 @@ class AutoAdminAlgorithm(SelectionAlgorithm):
             number_indexes,
         )
 
-        log_out = (
-            f"lowest cost (greedy): {costs}\n"
-            f"\tlowest cost indexes (greedy): {indexes}\n"
-            f"(greedy): number indexes {len(indexes)}\n"
+        logging.debug(
+            "lowest cost (greedy): %s\n"
+            "\tlowest cost indexes (greedy): %s\n"
+            "(greedy): number indexes %s\n",
+            costs,
+            indexes,
+            len(indexes),
         )
-        logging.debug(log_out)
 
         return set(indexes)
 
@@ -147,7 +150,7 @@ class AutoAdminAlgorithm(SelectionAlgorithm):
         # (index, cost)
         best_index = (None, None)
 
-        logging.debug(f"Searching in {len(candidate_indexes)} indexes")
+        logging.debug("Searching in %s indexes", len(candidate_indexes))
 
         for index in candidate_indexes:
             cost = self._simulate_and_evaluate_cost(workload, current_indexes | {index})
@@ -158,7 +161,7 @@ class AutoAdminAlgorithm(SelectionAlgorithm):
             candidate_indexes.remove(best_index[0])
             current_costs = best_index[1]
 
-            logging.debug(f"Additional best index found: {best_index}")
+            logging.debug("Additional best index found: %s", best_index)
 
             return self.enumerate_greedy(
                 workload,
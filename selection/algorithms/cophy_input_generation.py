@@ -72,8 +72,9 @@ class CoPhyInputGeneration(SelectionAlgorithm):
                 )
             )
             logging.info(
-                f"Evaluate {number_of_index_combinations} index combinations "
-                f"with {number_of_indexes_per_query} indexes per query:"
+                "Evaluate %s index combinations with %s indexes per query:",
+                number_of_index_combinations,
+                number_of_indexes_per_query,
             )
             i = 0
             for index_combination in itertools.combinations(
@@ -81,7 +82,7 @@ class CoPhyInputGeneration(SelectionAlgorithm):
             ):
                 i += 1
                 if i % 10000 == 0:
-                    logging.info(f"  ... {i} / {number_of_index_combinations} done")
+                    logging.info("  ... %s / %s done", i, number_of_index_combinations)
                 is_useful_combination = False
                 costs_per_query = {}
                 for query in workload.queries:
@@ -96,7 +97,7 @@ class CoPhyInputGeneration(SelectionAlgorithm):
                     query_costs_for_index_combination[index_combination] = costs_per_query
                     for index in index_combination:
                         useful_indexes.add(index)
-            logging.info(f"  ... {i} / {number_of_index_combinations} done")
+            logging.info("  ... %s / %s done", i, number_of_index_combinations)
 
         return useful_indexes, query_costs_for_index_combination
 
@@ -138,12 +139,12 @@ class CoPhyInputGeneration(SelectionAlgorithm):
         useful_indexes: Set[Index] = set()
         query_costs_for_index_combination = {}
         number_of_index_combinations = len(index_combinations_for_workload)
-        logging.info(f"Evaluate {number_of_index_combinations} index combinations ")
+        logging.info("Evaluate %s index combinations ", number_of_index_combinations)
         i = 0
         for index_combination in index_combinations_for_workload:
             i += 1
             if i % 10000 == 0:
-                logging.info(f"  ... {i} / {number_of_index_combinations} done")
+                logging.info("  ... %s / %s done", i, number_of_index_combinations)
             is_useful_combination = False
             costs_per_query = {}
             for query in workload.queries:
@@ -158,7 +159,7 @@ class CoPhyInputGeneration(SelectionAlgorithm):
                 query_costs_for_index_combination[index_combination] = costs_per_query
                 for index in index_combination:
                     useful_indexes.add(index)
-        logging.info(f"  ... {i} / {number_of_index_combinations} done")
+        logging.info("  ... %s / %s done", i, number_of_index_combinations)
 
         return useful_indexes, query_costs_for_index_combination
 
@@ -183,7 +184,7 @@ class CoPhyInputGeneration(SelectionAlgorithm):
             assert False, f'Invalid enumeration type: {self.parameters["enumeration"]}'
 
         what_if_time = time.time() - time_start
-        logging.info(f"What-if time: {what_if_time} s")
+        logging.info("What-if time: %s s", what_if_time)
         # construct data structures to output later
         cophy_dict = {
             "what_if_time": what_if_time,
@@ -257,17 +258,19 @@ class CoPhyInputGeneration(SelectionAlgorithm):
             )
             if os.path.isfile(path_base + ".txt") and not self.parameters["overwrite"]:
                 logging.info(
-                    f"A datafile already exists for at {path_base + '.txt'}. "
-                    f"Set parameter overwrite to True if you want to overwrite."
-                    f"Output to stdout"
+                    "A datafile already exists for at %s. "
+                    "Set parameter overwrite to True if you want to overwrite."
+                    "Output to stdout",
+                    path_base + ".txt",
                 )
             else:
                 ampl_file_path = path_base + ".txt"
             if os.path.isfile(path_base + ".json") and not self.parameters["overwrite"]:
                 logging.info(
-                    f"A jsonfile already exists for at {path_base + '.json'}. "
-                    f"Set parameter overwrite to True if you want to overwrite."
-                    f"Output to stdout"
+                    "A jsonfile already exists for at %s. "
+                    "Set parameter overwrite to True if you want to overwrite."
+                    "Output to stdout",
+                    path_base + ".json",
                 )
             else:
                 json_file_path = path_base + ".json"
@@ -283,7 +286,7 @@ def output_as_ampl(cophy_dict: Dict, file_path: str = None) -> None:
         folder = "/".join(file_path.split("/")[:-1])
         os.makedirs(folder, exist_ok=True)
         if os.path.isfile(file_path):
-            logging.info(f"Overwriting {file_path}")
+            logging.info("Overwriting %s", file_path)
         handle = open(file_path, "w+")
     else:
         handle = sys.stdout
@@ -323,7 +326,7 @@ def output_as_ampl(cophy_dict: Dict, file_path: str = None) -> None:
             f'{query_costs["costs"]}\n'
         )
     handle.write(";\n")
-    logging.info(f"Wrote file to {file_path}")
+    logging.info("Wrote file to %s", file_path)
 
     if handle is not sys.stdout:
         handle.close()
@@ -335,13 +338,13 @@ def output_as_json(cophy_dict: Dict, json_path: str = None) -> None:
         folder = "/".join(json_path.split("/")[:-1])
         os.makedirs(folder, exist_ok=True)
         if os.path.isfile(json_path):
-            logging.info(f"Overwriting {json_path}")
+            logging.info("Overwriting %s", json_path)
         handle = open(json_path, "w+")
     else:
         handle = sys.stdout
 
     json.dump(cophy_dict, handle, indent=4)
-    logging.info(f"Wrote file to {json_path}")
+    logging.info("Wrote file to %s", json_path)
 
     if handle is not sys.stdout:
         handle.close()
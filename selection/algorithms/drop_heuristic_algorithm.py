@@ -39,10 +39,9 @@ class DropHeuristicAlgorithm(SelectionAlgorithm):
                     lowest_cost, index_to_drop = cost, index
             remaining_indexes.remove(index_to_drop)
             logging.info(
-                (
-                    f"Dropping Index: {index_to_drop}. "
-                    f"{len(remaining_indexes)} indexes remaining."
-                )
+                "Dropping Index: %s. %s indexes remaining.",
+                index_to_drop,
+                len(remaining_indexes),
             )
 
         return remaining_indexes
@@ -47,8 +47,8 @@ class ExtendAlgorithmAnytime(SelectionAlgorithm):
         consumed_time = current_time - self.start_time
         if consumed_time > self.max_runtime_minutes * 60:
             logging.debug(
-                f"Stopping because of timing constraints. "
-                f"Time: {consumed_time / 60:.2f} minutes."
+                "Stopping because of timing constraints. Time: %.2f minutes.",
+                consumed_time / 60,
             )
 
             return True
@@ -106,10 +106,11 @@ class ExtendAlgorithmAnytime(SelectionAlgorithm):
                 index.estimated_size for index in index_combination
             )
             logging.debug(
-                "Add index. Current cost savings: "
-                f"{(1 - best['cost'] / current_cost) * 100:.3f}, "
-                f"initial {(1 - best['cost'] / self.initial_cost) * 100:.3f}. "
-                f"Current storage: {index_combination_size:.2f}"
+                "Add index. Current cost savings: %.3f, initial %.3f. "
+                "Current storage: %.2f",
+                (1 - best["cost"] / current_cost) * 100,
+                (1 - best["cost"] / self.initial_cost) * 100,
+                index_combination_size,
             )
 
             best["benefit_to_size_ratio"] = 0
@@ -167,9 +168,7 @@ class ExtendAlgorithmAnytime(SelectionAlgorithm):
         total_size = sum(index.estimated_size for index in index_combination)
 
         if ratio > best["benefit_to_size_ratio"] and total_size <= self.budget:
-            logging.debug(
-                f"new best cost and size: {cost}\t" f"{b_to_mb(total_size):.2f}MB"
-            )
+            logging.debug("new best cost and size: %s\t%.2fMB", cost, b_to_mb(total_size))
             best["combination"] = index_combination
             best["benefit_to_size_ratio"] = ratio
             best["cost"] = cost
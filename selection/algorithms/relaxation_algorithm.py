@@ -64,8 +64,9 @@ class RelaxationAlgorithm(SelectionAlgorithm):
         cp_cost = self.cost_evaluation.calculate_cost(workload, cp, store_size=True)
         while cp_size > self.disk_constraint:
             logging.debug(
-                f"Size of current configuration: {cp_size}. "
-                f"Budget: {self.disk_constraint}."
+                "Size of current configuration: %s. Budget: %s.",
+                cp_size,
+                self.disk_constraint,
             )
 
             # Pick a configuration that can be relaxed
@@ -53,7 +53,7 @@ class Benchmark:
     def benchmark(self):
         self.db_connector.drop_indexes()
 
-        logging.info("Benchmark with config: {}".format(self.config))
+        logging.info("Benchmark with config: %s", self.config)
         # Number of runs can be set to 0 to get estimated workload
         # costs. Estimated sizes are returned instead of actual index sizes
         # to avoid creating the indexes.
@@ -61,8 +61,7 @@ class Benchmark:
             self._create_indexes()
         else:
             self.index_create_time = 0
-            for index in self.indexes:
-                self.what_if.simulate_index(index, store_size=True)
+            self.what_if.simulate_indexes(self.indexes, store_size=True)
         self._benchmark()
         if self.number_of_runs > 0:
             self._drop_indexes()
@@ -143,7 +142,7 @@ class Benchmark:
             entry = header + "\n" + entry
         with open(self.filename, "a") as f:
             f.write(entry + "\n")
-        logging.info(f"Results written to {self.filename}")
+        logging.info("Results written to %s", self.filename)
 
     def _benchmark(self):
         logging.info("Benchmark all queries")
@@ -158,26 +157,26 @@ class Benchmark:
                 plans[query.nr].append(plan)
             results[query_id]["Cost"] = cost
         for i in range(self.number_of_runs):
-            logging.debug("Benchmark Run {}".format(i))
+            logging.debug("Benchmark Run %s", i)
             random_query_indexes = list(range(len(self.workload.queries)))
             seed = time.time()
             if self.seed:
                 seed = self.seed
-            logging.debug(f"Random seed: {seed}")
+            logging.debug("Random seed: %s", seed)
             random.seed(seed)
             random.shuffle(random_query_indexes)
             for query_index in random_query_indexes:
                 query = self.workload.queries[query_index]
-                logging.debug("Run {}".format(query))
+                logging.debug("Run %s", query)
                 execution_time, plan = self._benchmark_query(query)
                 results[query_index]["Runtimes"].append(execution_time)
                 results[query_index]["Hits"].append(self._calculate_hits(plan))
                 plans[query.nr].append(plan)
-        logging.debug("Execution times: {}".format(results))
+        logging.debug("Execution times: %s", results)
         overall_costs = sum(
             [results[query_id]["Cost"] for query_id in range(len(self.workload.queries))]
         )
-        logging.debug(f"Overall Costs: {overall_costs}")
+        logging.debug("Overall Costs: %s", overall_costs)
         self._store_results(results, plans)
 
     def _benchmark_query(self, query):
@@ -196,7 +195,7 @@ class Benchmark:
         logging.info("Creating the indexes")
         start_time = time.time()
         for index in self.indexes:
-            logging.debug("create index on {}".format(index))
+            logging.debug("create index on %s", index)
             self.db_connector.create_index(index)
         self.index_create_time = round(time.time() - start_time, 2)
 
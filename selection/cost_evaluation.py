@@ -68,22 +68,41 @@ class CostEvaluation:
             self.completed is False
         ), "Cost Evaluation is completed and cannot be reused."
         self._prepare_cost_calculation(indexes, store_size=store_size)
-        total_cost = 0
 
+        cache_keys = [self._cache_key(query, indexes) for query in workload.queries]
+        self.cost_requests += len(cache_keys)
+        # Costs that are not cached are requested from the database system at once
+        missing_keys = list(dict.fromkeys(x for x in cache_keys if x not in self.cache))
+        self.cache_hits += len(cache_keys) - len(missing_keys)
+        if missing_keys:
+            costs = self._get_costs([query for query, _ in missing_keys])
+            self.cache.update(zip(missing_keys, costs))
+
+        total_cost = 0
         # TODO: Make query cost higher for queries which are running often
-        for query in workload.queries:
-            self.cost_requests += 1
-            total_cost += self._request_cache(query, indexes)
+        for cache_key in cache_keys:
+            total_cost += self.cache[cache_key]
         return total_cost
 
     # Creates the current index combination by simulating/creating
     # missing indexes and unsimulating/dropping indexes
     # that exist but are not in the combination.
     def _prepare_cost_calculation(self, indexes, store_size=False):
-        for index in set(indexes) - self.current_indexes:
-            self._simulate_or_create_index(index, store_size=store_size)
-        for index in self.current_indexes - set(indexes):
-            self._unsimulate_or_drop_index(index)
+        missing_indexes = set(indexes) - self.current_indexes
+        if self.cost_estimation == "whatif" and len(missing_indexes) > 1:
+            self.what_if.simulate_indexes(missing_indexes, store_size=store_size)
+            self.current_indexes |= missing_indexes
+        else:
+            for index in missing_indexes:
+                self._simulate_or_create_index(index, store_size=store_size)
+
+        superfluous_indexes = self.current_indexes - set(indexes)
+        if self.cost_estimation == "whatif" and len(superfluous_indexes) > 1:
+            self.what_if.drop_simulated_indexes(superfluous_indexes)
+            self.current_indexes -= superfluous_indexes
+        else:
+            for index in superfluous_indexes:
+                self._unsimulate_or_drop_index(index)
 
         assert self.current_indexes == set(indexes)
 
@@ -108,6 +127,11 @@ class CostEvaluation:
             runtime = self.db_connector.exec_query(query)[0]
             return runtime
 
+    def _get_costs(self, queries):
+        if self.cost_estimation == "whatif":
+            return self.db_connector.get_costs(queries)
+        return [self._get_cost(query) for query in queries]
+
     def complete_cost_estimation(self):
         self.completed = True
 
@@ -116,7 +140,8 @@ class CostEvaluation:
 
         assert self.current_indexes == set()
 
-    def _request_cache(self, query, indexes):
+    # Costs are cached per query and the indexes that are relevant for it
+    def _cache_key(self, query, indexes):
         q_i_hash = (query, frozenset(indexes))
         if q_i_hash in self.relevant_indexes_cache:
             relevant_indexes = self.relevant_indexes_cache[q_i_hash]
@@ -124,15 +149,7 @@ class CostEvaluation:
             relevant_indexes = self._relevant_indexes(query, indexes)
             self.relevant_indexes_cache[q_i_hash] = relevant_indexes
 
-        # Check if query and corresponding relevant indexes in cache
-        if (query, relevant_indexes) in self.cache:
-            self.cache_hits += 1
-            return self.cache[(query, relevant_indexes)]
-        # If no cache hit request cost from database system
-        else:
-            cost = self._get_cost(query)
-            self.cache[(query, relevant_indexes)] = cost
-            return cost
+        return (query, relevant_indexes)
 
     @staticmethod
     def _relevant_indexes(query, indexes):
@@ -1,25 +1,51 @@
+import functools
 import logging
 import time
 
 
+# Splits a query text into the view statements that have to be executed
+# beforehand and the actual select statement. Query texts do not change,
+# hence, the split is only done once per text.
+@functools.lru_cache(maxsize=4096)
+def _split_query_text(text):
+    view_statements = []
+    for query_statement in text.split(";"):
+        if "create view" in query_statement:
+            view_statements.append(query_statement)
+        elif "select" in query_statement or "SELECT" in query_statement:
+            return tuple(view_statements), query_statement
+    return tuple(view_statements), None
+
+
 class DatabaseConnector:
     def __init__(self, db_name, autocommit=False):
         self.db_name = db_name
         self.autocommit = autocommit
-        logging.debug("Database connector created: {}".format(db_name))
+        logging.debug("Database connector created: %s", db_name)
 
         # This does not reflect the number of unique simulated indexes but
         # the number of simulate_index calls
         self.simulated_indexes = 0
         self.cost_estimations = 0
-        self.cost_estimation_duration = 0
-        self.index_simulation_duration = 0
+        # Durations are accumulated as integer nanoseconds (see properties below)
+        self._cost_estimation_duration_ns = 0
+        self._index_simulation_duration_ns = 0
+
+    # In seconds
+    @property
+    def cost_estimation_duration(self):
+        return self._cost_estimation_duration_ns / 1e9
+
+    # In seconds
+    @property
+    def index_simulation_duration(self):
+        return self._index_simulation_duration_ns / 1e9
 
     def exec_only(self, statement):
         self._cursor.execute(statement)
 
-    def exec_fetch(self, statement, one=True):
-        self._cursor.execute(statement)
+    def exec_fetch(self, statement, one=True, parameters=None):
+        self._cursor.execute(statement, parameters)
         if one:
             return self._cursor.fetchone()
         return self._cursor.fetchall()
@@ -32,7 +58,7 @@ class DatabaseConnector:
 
     def close(self):
         self._connection.close()
-        logging.debug("Database connector closed: {}".format(self.db_name))
+        logging.debug("Database connector closed: %s", self.db_name)
 
     def rollback(self):
         self._connection.rollback()
@@ -42,50 +68,73 @@ class DatabaseConnector:
         self.exec_only(statement)
 
     def _prepare_query(self, query):
-        for query_statement in query.text.split(";"):
-            if "create view" in query_statement:
-                try:
-                    self.exec_only(query_statement)
-                except Exception as e:
-                    logging.error(e)
-            elif "select" in query_statement or "SELECT" in query_statement:
-                return query_statement
+        view_statements, select_statement = _split_query_text(query.text)
+        for view_statement in view_statements:
+            try:
+                self.exec_only(view_statement)
+            except Exception as e:
+                logging.error(e)
+        return select_statement
 
     def simulate_index(self, index):
         self.simulated_indexes += 1
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         result = self._simulate_index(index)
-        end_time = time.time()
-        self.index_simulation_duration += end_time - start_time
+        self._index_simulation_duration_ns += time.perf_counter_ns() - start_time
 
         return result
 
+    # Returns the results of _simulate_index for each of the given indexes.
+    # Connectors may override _simulate_indexes to simulate them in one round trip.
+    def simulate_indexes(self, indexes):
+        self.simulated_indexes += len(indexes)
+
+        start_time = time.perf_counter_ns()
+        results = self._simulate_indexes(indexes)
+        self._index_simulation_duration_ns += time.perf_counter_ns() - start_time
+
+        return results
+
     def drop_simulated_index(self, identifier):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         self._drop_simulated_index(identifier)
-        end_time = time.time()
-        self.index_simulation_duration += end_time - start_time
+        self._index_simulation_duration_ns += time.perf_counter_ns() - start_time
+
+    # Connectors may override _drop_simulated_indexes to drop all in one round trip
+    def drop_simulated_indexes(self, identifiers):
+        start_time = time.perf_counter_ns()
+        self._drop_simulated_indexes(identifiers)
+        self._index_simulation_duration_ns += time.perf_counter_ns() - start_time
 
     def get_cost(self, query):
         self.cost_estimations += 1
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         cost = self._get_cost(query)
-        end_time = time.time()
-        self.cost_estimation_duration += end_time - start_time
+        self._cost_estimation_duration_ns += time.perf_counter_ns() - start_time
 
         return cost
 
+    # Returns the costs of the given queries in the same order. Connectors may
+    # override _get_costs to estimate the costs of independent queries concurrently.
+    def get_costs(self, queries):
+        self.cost_estimations += len(queries)
+
+        start_time = time.perf_counter_ns()
+        costs = self._get_costs(queries)
+        self._cost_estimation_duration_ns += time.perf_counter_ns() - start_time
+
+        return costs
+
     # This is very similar to get_cost() above. Some algorithms need to directly access
     # get_plan. To not exclude it from costing, we add the instrumentation here.
     def get_plan(self, query):
         self.cost_estimations += 1
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         plan = self._get_plan(query)
-        end_time = time.time()
-        self.cost_estimation_duration += end_time - start_time
+        self._cost_estimation_duration_ns += time.perf_counter_ns() - start_time
 
         return plan
 
@@ -107,11 +156,21 @@ class DatabaseConnector:
     def _get_cost(self, query):
         raise NotImplementedError
 
+    def _get_costs(self, queries):
+        return [self._get_cost(query) for query in queries]
+
     def _get_plan(self, query):
         raise NotImplementedError
 
     def _simulate_index(self, index):
         raise NotImplementedError
 
+    def _simulate_indexes(self, indexes):
+        return [self._simulate_index(index) for index in indexes]
+
     def _drop_simulated_index(self, identifier):
         raise NotImplementedError
+
+    def _drop_simulated_indexes(self, identifiers):
+        for identifier in identifiers:
+            self._drop_simulated_index(identifier)
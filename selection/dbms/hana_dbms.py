@@ -25,7 +25,7 @@ class HanaDatabaseConnector(DatabaseConnector):
         self.create_connection()
         self._alter_configuration()
 
-        logging.debug("HANA connector created: {}".format(db_name))
+        logging.debug("HANA connector created: %s", db_name)
 
     def read_connection_file(self):
         with open("database_connection.json", "r") as file:
@@ -120,7 +120,7 @@ class HanaDatabaseConnector(DatabaseConnector):
 
     def create_database(self, database_name):
         self.exec_only("Create schema {}".format(database_name))
-        logging.info("Database (schema) {} created".format(database_name))
+        logging.info("Database (schema) %s created", database_name)
 
     def import_data(self, table, path):
         scp_target = f"{self.ssh_user}@{self.host}:{self.import_directory}"
@@ -132,7 +132,7 @@ class HanaDatabaseConnector(DatabaseConnector):
             f"into {table} with record delimited by '\\n' "
             "field delimited by '|'"
         )
-        logging.debug("Import csv statement {}".format(table))
+        logging.debug("Import csv statement %s", table)
         self.exec_only(import_statement)
 
     def get_plan(self, query):
@@ -188,7 +188,7 @@ class HanaDatabaseConnector(DatabaseConnector):
         for index in indexes:
             index_name = index[0]
             drop_stmt = "drop index {}".format(index_name)
-            logging.debug("Dropping index {}".format(index_name))
+            logging.debug("Dropping index %s", index_name)
             self.exec_only(drop_stmt)
 
     def create_statistics(self):
@@ -1,16 +1,171 @@
+import functools
 import logging
+import queue
 import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import psycopg2
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+    encodings,
+)
 
 from selection.database_connector import DatabaseConnector
 
+# Number of threads (and connections) used to estimate the costs of multiple queries
+COST_ESTIMATION_WORKERS = 4
+# Minimum number of uncached queries for a concurrent cost estimation. Smaller
+# batches are estimated sequentially on the connector's own connection.
+PARALLEL_COST_ESTIMATION_THRESHOLD = 8
+
+# Upper bound of idle connections kept per database, enough for a connector
+# and its cost estimation workers
+MAX_IDLE_CONNECTIONS = 1 + COST_ESTIMATION_WORKERS
+
+# Connections are kept open after close() and handed to the next connector of
+# the same database. This avoids a connection handshake per connector. Only idle
+# connections are referenced here, connections in use belong to their connector.
+# {database name: [idle connections]}
+_idle_connections = {}
+_idle_connections_lock = threading.Lock()
+
+# Maximum number of query plans kept per connector
+PLAN_CACHE_SIZE = 4096
+
+# Read size for data imports, the default of 8 KiB results in many small reads
+IMPORT_BUFFER_SIZE = 1 << 20
+
+_DAYS_REGEX = re.compile(r" ([0-9]+) days\)")
+_SUBQUERY_REGEX = re.compile(r"((from)|,)[  \n]*\(")
+# Total cost of a plan node in EXPLAIN's text format, e.g., `(cost=0.00..1.25 `
+_TOTAL_COST_REGEX = re.compile(r"\(cost=[0-9.]+\.\.([0-9.]+) ")
+
+
+# Query texts do not change, hence, the rewritten texts are cached
+@functools.lru_cache(maxsize=4096)
+def _update_query_text(text):
+    text = text.replace(";\nlimit ", " limit ").replace("limit -1", "")
+    text = _DAYS_REGEX.sub(r" interval '\1 days')", text)
+    text = _add_alias_subquery(text)
+    return text
+
+
+# PostgreSQL requires an alias for subqueries
+def _add_alias_subquery(query_text):
+    text = query_text.lower()
+    positions = []
+    for match in _SUBQUERY_REGEX.finditer(text):
+        counter = 1
+        pos = match.span()[1]
+        # Jump from bracket to bracket instead of iterating over every character
+        while counter > 0:
+            next_open = text.find("(", pos)
+            next_close = text.find(")", pos)
+            assert next_close != -1, "Unbalanced parentheses in query text."
+            if next_open != -1 and next_open < next_close:
+                counter += 1
+                pos = next_open + 1
+            else:
+                counter -= 1
+                pos = next_close + 1
+        next_word = query_text[pos:].lstrip().split(" ")[0].split("\n")[0]
+        if next_word[0] in [")", ","] or next_word in [
+            "limit",
+            "group",
+            "order",
+            "where",
+        ]:
+            positions.append(pos)
+    for pos in sorted(positions, reverse=True):
+        query_text = query_text[:pos] + " as alias123 " + query_text[pos:]
+    return query_text
+
+
+# Query texts do not change, hence, their drop view statements are only searched once
+@functools.lru_cache(maxsize=4096)
+def _drop_view_statements(text):
+    return tuple(statement for statement in text.split(";") if "drop view" in statement)
+
+
+# EXPLAIN statements are built and encoded once per query text. The resulting bytes
+# are passed to the cursor as they are.
+@functools.lru_cache(maxsize=4096)
+def _explain_statement(options, query_text, encoding):
+    return f"explain ({options}) {query_text}".encode(encoding)
+
+
+def _borrow_connection(db_name):
+    while True:
+        with _idle_connections_lock:
+            idle_connections = _idle_connections.get(db_name)
+            if not idle_connections:
+                break
+            connection = idle_connections.pop()
+        if connection.closed:
+            continue
+        # A terminated backend, e.g., after a server restart, is only noticed on use
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("select 1")
+            return connection
+        except psycopg2.OperationalError:
+            logging.debug("Discarding broken pooled connection to %s", db_name)
+            connection.close()
+    return psycopg2.connect("dbname={}".format(db_name))
+
+
+def _return_connection(db_name, connection):
+    with _idle_connections_lock:
+        idle_connections = _idle_connections.setdefault(db_name, [])
+        if len(idle_connections) < MAX_IDLE_CONNECTIONS:
+            idle_connections.append(connection)
+            return
+    connection.close()
+
+
+def _close_idle_connections(db_name):
+    with _idle_connections_lock:
+        idle_connections = _idle_connections.pop(db_name, [])
+    for connection in idle_connections:
+        connection.close()
+
 
 class PostgresDatabaseConnector(DatabaseConnector):
+    # Frequently issued statements, prepared once per connection on first use
+    PREPARED_STATEMENTS = {
+        "hypopg_create": "select * from hypopg_create_index($1)",
+        "hypopg_create_many": (
+            "select h.* from unnest($1::text[]) with ordinality as s(statement, nr), "
+            "lateral hypopg_create_index(s.statement) as h order by s.nr"
+        ),
+        "hypopg_drop": "select * from hypopg_drop_index($1)",
+        "hypopg_drop_many": "select hypopg_drop_index(oid) from unnest($1::oid[]) as oid",
+    }
+
     def __init__(self, db_name, autocommit=False):
         DatabaseConnector.__init__(self, db_name, autocommit=autocommit)
         self.db_system = "postgres"
         self._connection = None
+        # Database of the current connection, `db_name` might be changed beforehand
+        self._connection_db_name = None
+        self._prepared_statements = set()
+        # Hypothetical indexes of the current connection {oid: create statement}
+        self._active_simulated_indexes = {}
+        # LRU cache {(query text, active hypothetical indexes): plan}
+        self._plan_cache = OrderedDict()
+        # LRU cache {(query text, active hypothetical indexes): total cost}
+        self._cost_cache = OrderedDict()
+        # Metadata cache, maintained by the connector's index methods
+        self._number_of_indexes = None
+        # Size of all indexes in bytes, None if unknown
+        self._indexes_size = None
+        # Connectors (and their thread pool) for concurrent cost estimations,
+        # created on first use and kept until close()
+        self._cost_workers = None
+        self._cost_executor = None
 
         if not self.db_name:
             self.db_name = "postgres"
@@ -18,14 +173,44 @@ class PostgresDatabaseConnector(DatabaseConnector):
 
         self.set_random_seed()
 
-        logging.debug("Postgres connector created: {}".format(db_name))
+        logging.debug("Postgres connector created: %s", db_name)
 
     def create_connection(self):
         if self._connection:
             self.close()
-        self._connection = psycopg2.connect("dbname={}".format(self.db_name))
+        self._connection = _borrow_connection(self.db_name)
+        self._connection_db_name = self.db_name
         self._connection.autocommit = self.autocommit
         self._cursor = self._connection.cursor()
+        self._prepared_statements = set()
+        self._active_simulated_indexes = {}
+        self._invalidate_plan_cache()
+        self._number_of_indexes = None
+        self._indexes_size = None
+
+    def close(self):
+        self._close_cost_workers()
+        if self._connection is None:
+            return
+        if self._connection.closed:
+            self._connection = None
+            return
+
+        # Reset the session before handing the connection to the next connector.
+        # Hypothetical indexes are not covered by `discard all`.
+        try:
+            self._connection.rollback()
+            self._connection.autocommit = True
+            if self._active_simulated_indexes:
+                self.exec_only("select hypopg_reset()")
+            self.exec_only("discard all")
+        except psycopg2.Error as e:
+            logging.error(e)
+            self._connection.close()
+        else:
+            _return_connection(self._connection_db_name, self._connection)
+        self._connection = None
+        logging.debug("Database connector closed: %s", self.db_name)
 
     def enable_simulation(self):
         self.exec_only("create extension hypopg")
@@ -37,60 +222,56 @@ class PostgresDatabaseConnector(DatabaseConnector):
 
     # Updates query syntax to work in PostgreSQL
     def update_query_text(self, text):
-        text = text.replace(";\nlimit ", " limit ").replace("limit -1", "")
-        text = re.sub(r" ([0-9]+) days\)", r" interval '\1 days')", text)
-        text = self._add_alias_subquery(text)
-        return text
-
-    # PostgreSQL requires an alias for subqueries
-    def _add_alias_subquery(self, query_text):
-        text = query_text.lower()
-        positions = []
-        for match in re.finditer(r"((from)|,)[  \n]*\(", text):
-            counter = 1
-            pos = match.span()[1]
-            while counter > 0:
-                char = text[pos]
-                if char == "(":
-                    counter += 1
-                elif char == ")":
-                    counter -= 1
-                pos += 1
-            next_word = query_text[pos:].lstrip().split(" ")[0].split("\n")[0]
-            if next_word[0] in [")", ","] or next_word in [
-                "limit",
-                "group",
-                "order",
-                "where",
-            ]:
-                positions.append(pos)
-        for pos in sorted(positions, reverse=True):
-            query_text = query_text[:pos] + " as alias123 " + query_text[pos:]
-        return query_text
+        return _update_query_text(text)
 
     def create_database(self, database_name):
         self.exec_only("create database {}".format(database_name))
-        logging.info("Database {} created".format(database_name))
+        logging.info("Database %s created", database_name)
 
     def import_data(self, table, path, delimiter="|"):
-        with open(path, "r") as file:
-            self._cursor.copy_from(file, table, sep=delimiter, null="")
+        # COPY FREEZE requires the table to be created or truncated in the current
+        # transaction. Only empty tables, e.g., those just created by the
+        # TableGenerator, are truncated. Frozen rows do not need to be rewritten
+        # by a later vacuum.
+        self.commit()
+        self._connection.autocommit = False
+        try:
+            is_empty = not self.exec_fetch(f"select exists (select 1 from {table})")[0]
+            options = f"delimiter '{delimiter}', null ''"
+            if is_empty:
+                self.exec_only(f"truncate {table}")
+                options += ", freeze"
+            statement = f"copy {table} from stdin with ({options})"
+            with open(path, "rb", buffering=IMPORT_BUFFER_SIZE) as file:
+                self._cursor.copy_expert(statement, file, size=IMPORT_BUFFER_SIZE)
+            self.commit()
+        except Exception:
+            # Do not leave the truncate or a partial import pending
+            self.rollback()
+            raise
+        finally:
+            self._connection.autocommit = self.autocommit
 
     def indexes_size(self):
-        # Returns size in bytes
-        statement = (
-            "select sum(pg_indexes_size(table_name::text)) from "
-            "(select table_name from information_schema.tables "
-            "where table_schema='public') as all_tables"
-        )
-        result = self.exec_fetch(statement)
-        return result[0]
+        # Returns size in bytes. The size is queried only once and afterwards
+        # maintained by create_index(), drop_index(), and drop_indexes().
+        if self._indexes_size is None:
+            statement = (
+                "select sum(pg_indexes_size(table_name::text)) from "
+                "(select table_name from information_schema.tables "
+                "where table_schema='public') as all_tables"
+            )
+            result = self.exec_fetch(statement)
+            self._indexes_size = result[0]
+        return self._indexes_size
 
     def drop_database(self, database_name):
+        # Idle connections to the database would prevent dropping it
+        _close_idle_connections(database_name)
         statement = f"DROP DATABASE {database_name};"
         self.exec_only(statement)
 
-        logging.info(f"Database {database_name} dropped")
+        logging.info("Database %s dropped", database_name)
 
     def create_statistics(self):
         logging.info("Postgres: Run `analyze`")
@@ -98,9 +279,10 @@ class PostgresDatabaseConnector(DatabaseConnector):
         self._connection.autocommit = True
         self.exec_only("analyze")
         self._connection.autocommit = self.autocommit
+        self._invalidate_plan_cache()
 
     def set_random_seed(self, value=0.17):
-        logging.info(f"Postgres: Set random seed `SELECT setseed({value})`")
+        logging.info("Postgres: Set random seed `SELECT setseed(%s)`", value)
         self.exec_only(f"SELECT setseed({value})")
 
     def supports_index_simulation(self):
@@ -108,21 +290,56 @@ class PostgresDatabaseConnector(DatabaseConnector):
             return True
         return False
 
+    def _execute_prepared(self, name, parameters, one=True):
+        if name not in self._prepared_statements:
+            self.exec_only(f"prepare {name} as {self.PREPARED_STATEMENTS[name]}")
+            self._prepared_statements.add(name)
+        placeholders = ", ".join(["%s"] * len(parameters))
+        statement = f"execute {name}({placeholders})"
+        return self.exec_fetch(statement, one=one, parameters=parameters)
+
+    @staticmethod
+    def _simulated_index_statement(index):
+        return f"create index on {index.table()} ({index.joined_column_names()})"
+
     def _simulate_index(self, index):
-        table_name = index.table()
-        statement = (
-            "select * from hypopg_create_index( "
-            f"'create index on {table_name} "
-            f"({index.joined_column_names()})')"
-        )
-        result = self.exec_fetch(statement)
+        statement = self._simulated_index_statement(index)
+        result = self._execute_prepared("hypopg_create", (statement,))
+        self._active_simulated_indexes[result[0]] = statement
         return result
 
+    # Creates all hypothetical indexes with a single round trip
+    def _simulate_indexes(self, indexes):
+        statements = [self._simulated_index_statement(index) for index in indexes]
+        return self._simulate_index_statements(statements)
+
+    def _simulate_index_statements(self, statements):
+        if not statements:
+            return []
+        results = self._execute_prepared("hypopg_create_many", (statements,), one=False)
+        assert len(results) == len(statements), "Could not simulate all indexes."
+        for result, statement in zip(results, statements):
+            self._active_simulated_indexes[result[0]] = statement
+        return results
+
     def _drop_simulated_index(self, oid):
-        statement = f"select * from hypopg_drop_index({oid})"
-        result = self.exec_fetch(statement)
+        result = self._execute_prepared("hypopg_drop", (oid,))
 
         assert result[0] is True, f"Could not drop simulated index with oid = {oid}."
+        del self._active_simulated_indexes[oid]
+
+    # Drops all hypothetical indexes with a single round trip
+    def _drop_simulated_indexes(self, oids):
+        if not oids:
+            return
+        oids = list(oids)
+        results = self._execute_prepared("hypopg_drop_many", (oids,), one=False)
+
+        assert all(
+            result[0] is True for result in results
+        ), f"Could not drop all simulated indexes with oids = {oids}."
+        for oid in oids:
+            del self._active_simulated_indexes[oid]
 
     def create_index(self, index):
         table_name = index.table()
@@ -136,16 +353,34 @@ class PostgresDatabaseConnector(DatabaseConnector):
         )
         size = size[0]
         index.estimated_size = size * 8 * 1024
+        self._invalidate_plan_cache()
+        self._number_of_indexes = None
+        if self._indexes_size is not None:
+            self._indexes_size += index.estimated_size
+
+    def drop_index(self, index):
+        DatabaseConnector.drop_index(self, index)
+        self._invalidate_plan_cache()
+        self._number_of_indexes = None
+        if self._indexes_size is not None and index.estimated_size is not None:
+            self._indexes_size -= index.estimated_size
+        else:
+            self._indexes_size = None
 
     def drop_indexes(self):
         logging.info("Dropping indexes")
         stmt = "select indexname from pg_indexes where schemaname='public'"
         indexes = self.exec_fetch(stmt, one=False)
-        for index in indexes:
-            index_name = index[0]
-            drop_stmt = "drop index {}".format(index_name)
-            logging.debug("Dropping index {}".format(index_name))
+        index_names = [index[0] for index in indexes]
+        for index_name in index_names:
+            logging.debug("Dropping index %s", index_name)
+        # A single statement drops all indexes with one round trip
+        if index_names:
+            drop_stmt = "drop index {}".format(", ".join(index_names))
             self.exec_only(drop_stmt)
+        self._invalidate_plan_cache()
+        self._number_of_indexes = None
+        self._indexes_size = 0
 
     # PostgreSQL expects the timeout in milliseconds
     def exec_query(self, query, timeout=None, cost_evaluation=False):
@@ -153,46 +388,175 @@ class PostgresDatabaseConnector(DatabaseConnector):
         if not cost_evaluation:
             self._connection.commit()
         query_text = self._prepare_query(query)
+        statement = self._explain_statement("analyze, buffers, format json", query_text)
+        # Sent together with the query to save a round trip. With autocommit, a local
+        # setting ends with the implicit transaction, no reset is required.
+        # Otherwise, the transaction continues and the timeout is reset below.
+        reset_timeout = timeout and not self._connection.autocommit
         if timeout:
-            set_timeout = f"set statement_timeout={timeout}"
-            self.exec_only(set_timeout)
-        statement = f"explain (analyze, buffers, format json) {query_text}"
+            scope = "" if reset_timeout else "local "
+            statement = f"set {scope}statement_timeout = {timeout}; ".encode() + statement
         try:
             plan = self.exec_fetch(statement, one=True)[0][0]["Plan"]
             result = plan["Actual Total Time"], plan
         except Exception as e:
-            logging.error(f"{query.nr}, {e}")
+            logging.error("%s, %s", query.nr, e)
             self._connection.rollback()
             result = None, self._get_plan(query)
-        # Disable timeout
-        self._cursor.execute("set statement_timeout = 0")
+        if reset_timeout:
+            self.exec_only("set statement_timeout = 0")
         self._cleanup_query(query)
         return result
 
     def _cleanup_query(self, query):
-        for query_statement in query.text.split(";"):
-            if "drop view" in query_statement:
-                self.exec_only(query_statement)
-                self.commit()
+        for query_statement in _drop_view_statements(query.text):
+            self.exec_only(query_statement)
+            self.commit()
 
+    # Only the total cost is required here. Instead of building the JSON plan,
+    # it is extracted from the first line (root node) of the text format.
     def _get_cost(self, query):
-        query_plan = self._get_plan(query)
-        total_cost = query_plan["Total Cost"]
+        key = self._plan_cache_key(query)
+        total_cost = self._cached_cost(key)
+        if total_cost is not None:
+            return total_cost
+
+        query_text = self._prepare_query(query)
+        statement = self._explain_statement("format text", query_text)
+        root_node = self.exec_fetch(statement)[0]
+        total_cost = float(_TOTAL_COST_REGEX.search(root_node).group(1))
+        self._cleanup_query(query)
+
+        self._add_to_cache(self._cost_cache, key, total_cost)
         return total_cost
 
+    def _explain_statement(self, options, query_text):
+        encoding = encodings[self._connection.encoding]
+        return _explain_statement(options, query_text, encoding)
+
+    def _cached_cost(self, key):
+        if key in self._plan_cache:
+            self._plan_cache.move_to_end(key)
+            return self._plan_cache[key]["Total Cost"]
+        if key in self._cost_cache:
+            self._cost_cache.move_to_end(key)
+            return self._cost_cache[key]
+        return None
+
+    # The costs of queries are independent of each other and are, thus, estimated
+    # concurrently. Each worker uses its own connection and keeps the current
+    # hypothetical indexes there because these are bound to a connection.
+    # Uncommitted changes of this connector would not be visible to the workers.
+    # Hence, an open transaction is committed first, as exec_query() does.
+    def _get_costs(self, queries):
+        # {cache key: query} for queries without cached costs, duplicates removed
+        uncached_queries = {}
+        for query in queries:
+            key = self._plan_cache_key(query)
+            if self._cached_cost(key) is None:
+                uncached_queries[key] = query
+
+        transaction_status = self._connection.get_transaction_status()
+        if len(uncached_queries) >= PARALLEL_COST_ESTIMATION_THRESHOLD and (
+            transaction_status in [TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS]
+        ):
+            if transaction_status == TRANSACTION_STATUS_INTRANS:
+                self.commit()
+            index_statements = list(self._active_simulated_indexes.values())
+            workers = self._get_cost_workers()
+
+            def estimate_cost(query):
+                worker = workers.get()
+                try:
+                    worker._synchronize_simulated_indexes(index_statements)
+                    return worker._get_cost(query)
+                finally:
+                    workers.put(worker)
+
+            costs = self._cost_executor.map(estimate_cost, uncached_queries.values())
+            for key, total_cost in zip(uncached_queries, costs):
+                self._add_to_cache(self._cost_cache, key, total_cost)
+
+        return [self._get_cost(query) for query in queries]
+
+    def _get_cost_workers(self):
+        if self._cost_workers is None:
+            self._cost_executor = ThreadPoolExecutor(max_workers=COST_ESTIMATION_WORKERS)
+            self._cost_workers = queue.Queue()
+            for worker in self._cost_executor.map(
+                lambda _: PostgresDatabaseConnector(self.db_name, autocommit=True),
+                range(COST_ESTIMATION_WORKERS),
+            ):
+                self._cost_workers.put(worker)
+        return self._cost_workers
+
+    def _close_cost_workers(self):
+        if self._cost_workers is None:
+            return
+        self._cost_executor.shutdown()
+        while not self._cost_workers.empty():
+            self._cost_workers.get().close()
+        self._cost_workers = None
+        self._cost_executor = None
+
+    # Brings the hypothetical indexes in line with the given create statements.
+    # Only the difference to the currently simulated indexes is dropped or created.
+    def _synchronize_simulated_indexes(self, statements):
+        missing_statements = Counter(statements)
+        superfluous_oids = []
+        for oid, statement in self._active_simulated_indexes.items():
+            if missing_statements[statement] > 0:
+                missing_statements[statement] -= 1
+            else:
+                superfluous_oids.append(oid)
+        self._drop_simulated_indexes(superfluous_oids)
+        self._simulate_index_statements(list(missing_statements.elements()))
+
     def _get_plan(self, query):
+        key = self._plan_cache_key(query)
+        if key in self._plan_cache:
+            self._plan_cache.move_to_end(key)
+            return self._plan_cache[key]
+
         query_text = self._prepare_query(query)
-        statement = f"explain (format json) {query_text}"
+        statement = self._explain_statement("format json", query_text)
         query_plan = self.exec_fetch(statement)[0][0]["Plan"]
         self._cleanup_query(query)
+
+        self._add_to_cache(self._plan_cache, key, query_plan)
         return query_plan
 
-    def number_of_indexes(self):
-        statement = """select count(*) from pg_indexes
-                       where schemaname = 'public'"""
-        result = self.exec_fetch(statement)
-        return result[0]
+    # The plan only depends on the query and the (hypothetical) index
+    # configuration. Oids are part of the key because plans contain the
+    # names of hypothetical indexes, which are derived from their oids.
+    def _plan_cache_key(self, query):
+        return (query.text, frozenset(self._active_simulated_indexes.items()))
+
+    @staticmethod
+    def _add_to_cache(cache, key, value):
+        cache[key] = value
+        if len(cache) > PLAN_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    # Must be called whenever actual indexes or statistics change
+    def _invalidate_plan_cache(self):
+        self._plan_cache.clear()
+        self._cost_cache.clear()
+        # Idle workers are in the queue, none is in use outside of _get_costs()
+        if self._cost_workers is not None:
+            for worker in self._cost_workers.queue:
+                worker._invalidate_plan_cache()
 
+    def number_of_indexes(self):
+        if self._number_of_indexes is None:
+            statement = """select count(*) from pg_indexes
+                           where schemaname = 'public'"""
+            result = self.exec_fetch(statement)
+            self._number_of_indexes = result[0]
+        return self._number_of_indexes
+
+    # Tables and databases might be created or dropped with plain statements or
+    # by other connectors. Hence, these lookups are not cached.
     def table_exists(self, table_name):
         statement = f"""SELECT EXISTS (
             SELECT 1
@@ -14,6 +14,16 @@ class WhatIfIndexCreation:
 
     def simulate_index(self, potential_index, store_size=False):
         result = self.db_connector.simulate_index(potential_index)
+        self._register_simulated_index(potential_index, result, store_size)
+
+    # Simulates all given indexes with a single request to the database connector
+    def simulate_indexes(self, potential_indexes, store_size=False):
+        potential_indexes = list(potential_indexes)
+        results = self.db_connector.simulate_indexes(potential_indexes)
+        for potential_index, result in zip(potential_indexes, results):
+            self._register_simulated_index(potential_index, result, store_size)
+
+    def _register_simulated_index(self, potential_index, result, store_size):
         index_oid = result[0]
         index_name = result[1]
         self.simulated_indexes[index_oid] = index_name
@@ -28,6 +38,13 @@ class WhatIfIndexCreation:
         self.db_connector.drop_simulated_index(oid)
         del self.simulated_indexes[oid]
 
+    # Drops all given indexes with a single request to the database connector
+    def drop_simulated_indexes(self, indexes):
+        oids = [index.hypopg_oid for index in indexes]
+        self.db_connector.drop_simulated_indexes(oids)
+        for oid in oids:
+            del self.simulated_indexes[oid]
+
     def all_simulated_indexes(self):
         statement = "select * from hypopg_list_indexes()"
         indexes = self.db_connector.exec_fetch(statement, one=False)
@@ -48,6 +65,5 @@ class WhatIfIndexCreation:
         return [x[1] for x in indexes]
 
     def drop_all_simulated_indexes(self):
-        for key in self.simulated_indexes:
-            self.db_connector.drop_simulated_index(key)
+        self.db_connector.drop_simulated_indexes(list(self.simulated_indexes))
         self.simulated_indexes = {}
@@ -49,6 +49,9 @@ class TestCostEvaluation(unittest.TestCase):
         # By also mocking some of its methods, we can test how often these are called.
         self.connector = MockConnector()
         self.connector.get_cost = MagicMock(return_value=3)
+        self.connector.get_costs = MagicMock(
+            side_effect=lambda queries: [self.connector.get_cost(q) for q in queries]
+        )
         self.connector.simulate_index = MagicMock(
             return_value=[0, "index_name"]
         )  # index_oid, index_name
@@ -167,8 +170,9 @@ class TestCostEvaluation(unittest.TestCase):
         self.connector.simulate_index.assert_called_with(index_1)
 
     def test_which_indexes_utilized_and_cost(self):
-        def _simulate_index_mock(index, store_size):
-            index.hypopg_name = f"<1337>btree_{index.columns}"
+        def _simulate_indexes_mock(indexes, store_size):
+            for index in indexes:
+                index.hypopg_name = f"<1337>btree_{index.columns}"
 
         # For some reason, the database decides to only use an index for one of
         # the filters
@@ -190,8 +194,8 @@ class TestCostEvaluation(unittest.TestCase):
         self.cost_evaluation.db_connector.get_plan = MagicMock(
             side_effect=_simulate_get_plan
         )
-        self.cost_evaluation.what_if.simulate_index = MagicMock(
-            side_effect=_simulate_index_mock
+        self.cost_evaluation.what_if.simulate_indexes = MagicMock(
+            side_effect=_simulate_indexes_mock
         )
 
         candidates = syntactically_relevant_indexes(query, max_index_width=2)
@@ -201,8 +205,9 @@ class TestCostEvaluation(unittest.TestCase):
         self.assertEqual(cost, 17)
         self.assertEqual(indexes, {Index([self.columns[1]])})
 
-        self.assertEqual(
-            self.cost_evaluation.what_if.simulate_index.call_count, len(candidates)
+        # All candidates are simulated with a single request
+        self.cost_evaluation.what_if.simulate_indexes.assert_called_once_with(
+            set(candidates), store_size=True
         )
         self.cost_evaluation.db_connector.get_plan.assert_called_once_with(query)
         self.assertCountEqual(self.cost_evaluation.current_indexes, candidates)
@@ -285,6 +290,35 @@ class TestPrepareCostEvaluation(unittest.TestCase):
             self.cost_evaluation.current_indexes, set([self.index_0, self.index_2])
         )
 
+    def test_prepare_cost_calculation_multiple_indexes_added(self):
+        self.mock_what_if.simulate_indexes = MagicMock()
+        self.cost_evaluation.current_indexes = set([self.index_0])
+
+        self.cost_evaluation._prepare_cost_calculation(
+            [self.index_0, self.index_1, self.index_2]
+        )
+        self.mock_what_if.simulate_indexes.assert_called_once_with(
+            set([self.index_1, self.index_2]), store_size=False
+        )
+        self.mock_what_if.simulate_index.assert_not_called()
+        self.assertEqual(
+            self.cost_evaluation.current_indexes,
+            set([self.index_0, self.index_1, self.index_2]),
+        )
+
+    def test_prepare_cost_calculation_multiple_indexes_removed(self):
+        self.mock_what_if.drop_simulated_indexes = MagicMock()
+        self.cost_evaluation.current_indexes = set(
+            [self.index_0, self.index_1, self.index_2]
+        )
+
+        self.cost_evaluation._prepare_cost_calculation([self.index_0])
+        self.mock_what_if.drop_simulated_indexes.assert_called_once_with(
+            set([self.index_1, self.index_2])
+        )
+        self.mock_what_if.drop_simulated_index.assert_not_called()
+        self.assertEqual(self.cost_evaluation.current_indexes, set([self.index_0]))
+
     def test_complete_cost_estimation(self):
         self.cost_evaluation.current_indexes = set([self.index_0, self.index_1])
         self.assertFalse(self.cost_evaluation.completed)
@@ -1,5 +1,7 @@
 import unittest
 
+from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+
 from selection.dbms.postgres_dbms import PostgresDatabaseConnector
 from selection.index import Index
 from selection.table_generator import TableGenerator
@@ -54,6 +56,178 @@ class TestDatabase(unittest.TestCase):
         db.drop_simulated_index(index_oid)
         self.assertGreater(db.index_simulation_duration, previou_simulation_duration)
 
+    def test_pooled_connection_reuse(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+        connection = db._connection
+
+        column_n_name = Column("n_name")
+        nation_table = Table("nation")
+        nation_table.add_column(column_n_name)
+        db.simulate_index(Index([column_n_name]))
+        db.close()
+
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+        self.assertIs(db._connection, connection)
+        # Hypothetical indexes and prepared statements are reset on close()
+        statement = "select * from hypopg_list_indexes()"
+        self.assertEqual(db.exec_fetch(statement, one=False), [])
+        index_oid = db.simulate_index(Index([column_n_name]))[0]
+        db.drop_simulated_index(index_oid)
+        db.close()
+
+    def test_pooled_connection_terminated(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+        backend_pid = db.exec_fetch("select pg_backend_pid()")[0]
+        db.close()
+
+        connector = PostgresDatabaseConnector(None, autocommit=True)
+        connector.exec_fetch(f"select pg_terminate_backend({backend_pid})")
+        connector.close()
+
+        # The terminated connection is discarded instead of being handed out
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+        self.assertNotEqual(db.exec_fetch("select pg_backend_pid()")[0], backend_pid)
+        db.close()
+
+    def test_plan_cache(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+
+        query = Query(17, "SELECT count(*) FROM nation;")
+        plan = db.get_plan(query)
+        self.assertIs(db.get_plan(query), plan)
+        self.assertEqual(db.cost_estimations, 2)
+
+        column_n_name = Column("n_name")
+        nation_table = Table("nation")
+        nation_table.add_column(column_n_name)
+        index_oid = db.simulate_index(Index([column_n_name]))[0]
+        self.assertIsNot(db.get_plan(query), plan)
+
+        db.drop_simulated_index(index_oid)
+        self.assertIs(db.get_plan(query), plan)
+        db.close()
+
+    def test_simulate_indexes(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+
+        nation_table = Table("nation")
+        column_n_name = Column("n_name")
+        column_n_comment = Column("n_comment")
+        nation_table.add_columns([column_n_name, column_n_comment])
+        indexes = [Index([column_n_name]), Index([column_n_comment])]
+
+        results = db.simulate_indexes(indexes)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(db.simulated_indexes, 2)
+        self.assertIn("n_name", results[0][1])
+        self.assertIn("n_comment", results[1][1])
+
+        db.drop_simulated_indexes([index_oid for index_oid, _ in results])
+        statement = "select * from hypopg_list_indexes()"
+        self.assertEqual(db.exec_fetch(statement, one=False), [])
+        db.close()
+
+    def test_metadata_caches(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+        self.assertTrue(db.database_exists(self.db_name))
+        self.assertTrue(db.table_exists("nation"))
+        self.assertFalse(db.table_exists("not_existing_table"))
+
+        column_n_name = Column("n_name")
+        nation_table = Table("nation")
+        nation_table.add_column(column_n_name)
+        index = Index([column_n_name])
+
+        number_of_indexes = db.number_of_indexes()
+        indexes_size = db.indexes_size()
+        db.create_index(index)
+        self.assertEqual(db.number_of_indexes(), number_of_indexes + 1)
+        self.assertEqual(db.indexes_size(), indexes_size + index.estimated_size)
+        db.drop_index(index)
+        self.assertEqual(db.number_of_indexes(), number_of_indexes)
+        self.assertEqual(db.indexes_size(), indexes_size)
+        db.close()
+
+    def test_cost_equals_plan_cost(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+
+        query = Query(17, "SELECT count(*) FROM nation WHERE n_regionkey = 1;")
+        cost = db.get_cost(query)
+        self.assertEqual(cost, db.get_plan(query)["Total Cost"])
+        db.close()
+
+    def test_get_costs(self):
+        db = PostgresDatabaseConnector(self.db_name, "postgres")
+
+        column_n_name = Column("n_name")
+        nation_table = Table("nation")
+        nation_table.add_column(column_n_name)
+        column_n_regionkey = Column("n_regionkey")
+        nation_table.add_column(column_n_regionkey)
+        index_result = db.simulate_index(Index([column_n_name]))
+
+        # Enough distinct queries for a concurrent estimation
+        queries = [
+            Query(nr, f"SELECT * FROM nation WHERE n_nationkey = {nr};")
+            for nr in range(10)
+        ]
+        queries.append(Query(10, "SELECT * FROM nation WHERE n_name = 'GERMANY';"))
+        queries.append(Query(11, "SELECT * FROM nation WHERE n_regionkey = 1;"))
+        costs = db.get_costs(queries)
+        self.assertEqual(db.cost_estimations, len(queries))
+
+        # Costs of the workers must reflect the hypothetical index as well
+        db._invalidate_plan_cache()
+        self.assertEqual(costs, [db.get_cost(query) for query in queries])
+
+        # The workers' hypothetical indexes follow those of the connector
+        db.drop_simulated_index(index_result[0])
+        db.simulate_index(Index([column_n_regionkey]))
+        costs = db.get_costs(queries)
+        db._invalidate_plan_cache()
+        self.assertEqual(costs, [db.get_cost(query) for query in queries])
+        db.close()
+        self.assertIsNone(db._cost_workers)
+
+    def test_get_costs_without_autocommit(self):
+        db = PostgresDatabaseConnector(self.db_name, autocommit=False)
+        # set_random_seed() in the constructor leaves a transaction open
+        transaction_status = db._connection.get_transaction_status()
+        self.assertEqual(transaction_status, TRANSACTION_STATUS_INTRANS)
+
+        queries = [
+            Query(nr, f"SELECT * FROM nation WHERE n_nationkey = {nr};")
+            for nr in range(10)
+        ]
+        costs = db.get_costs(queries)
+        self.assertIsNotNone(db._cost_workers)
+
+        db._invalidate_plan_cache()
+        self.assertEqual(costs, [db.get_cost(query) for query in queries])
+        db.close()
+
+    def test_get_costs_after_create_index(self):
+        db = PostgresDatabaseConnector(self.db_name, autocommit=True)
+
+        queries = [
+            Query(nr, f"SELECT * FROM lineitem WHERE l_orderkey = {nr};")
+            for nr in range(10)
+        ]
+        costs = db.get_costs(queries)
+
+        # The workers' cached costs must not outlive the index change
+        column_l_orderkey = Column("l_orderkey")
+        lineitem_table = Table("lineitem")
+        lineitem_table.add_column(column_l_orderkey)
+        index = Index([column_l_orderkey])
+        db.create_index(index)
+        costs_with_index = db.get_costs(queries)
+        db.drop_index(index)
+        db.close()
+
+        for cost, cost_with_index in zip(costs, costs_with_index):
+            self.assertLess(cost_with_index, cost)
+
 
 if __name__ == "__main__":
     unittest.main()
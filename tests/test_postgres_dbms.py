@@ -0,0 +1,39 @@
+import unittest
+
+from selection.dbms.postgres_dbms import _add_alias_subquery
+
+
+class TestAddAliasSubquery(unittest.TestCase):
+    def test_nested_subqueries(self):
+        query_text = (
+            "select * from (select a from (select a from t) where a = 1) order by a"
+        )
+        self.assertEqual(
+            _add_alias_subquery(query_text),
+            "select * from (select a from (select a from t) as alias123  where a = 1)"
+            " as alias123  order by a",
+        )
+
+    def test_existing_alias(self):
+        query_text = "select * from (select a from (select a from t) as x) where a = 1"
+        self.assertEqual(
+            _add_alias_subquery(query_text),
+            "select * from (select a from (select a from t) as x) as alias123  "
+            "where a = 1",
+        )
+
+    def test_multiple_subqueries(self):
+        query_text = "select * from (select a from t group by a), (select 1) limit 1"
+        self.assertEqual(
+            _add_alias_subquery(query_text),
+            "select * from (select a from t group by a) as alias123 , "
+            "(select 1) as alias123  limit 1",
+        )
+
+    def test_unbalanced_parentheses(self):
+        with self.assertRaises(AssertionError):
+            _add_alias_subquery("select * from (select a from (select a from t)")
+
+
+if __name__ == "__main__":
+    unittest.main()